@@ -0,0 +1,75 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+COST OF RAISING Except, WITH AN 8-DEEP CALL STACK, IN MICROSECONDS PER ITERATION
+
+Log.error + suppress       - RAISE AND IGNORE, THE TRACE IS NEVER LOOKED AT
+Except.wrap(KeyError)      - CONVERT A NATIVE EXCEPTION
+Log.error(cause=)          - RAISE WITH A CAUSE, AND CATCH
+render + __data__          - SAME, THEN RENDER TEXT AND SERIALIZE
+
+BEFORE LAZY STACK TRACES (user-045) ALL FOUR PAID FOR THE FULL TRACE
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import timeit
+
+from mo_logs import Except, Log
+from mo_logs.exceptions import suppress_exception
+
+DEPTH = 8
+NUMBER = 2000
+REPEAT = 5
+
+
+def deep(n, fn):
+    if n == 0:
+        return fn()
+    return deep(n - 1, fn)
+
+
+def raise_and_suppress():
+    with suppress_exception:
+        Log.error("problem with {{key}}", key="x")
+
+
+def wrap_native():
+    try:
+        {}["x"]
+    except Exception as e:
+        Except.wrap(e)
+
+
+def raise_with_cause():
+    try:
+        Log.error("problem with {{key}}", key="x", cause=KeyError("x"))
+    except Exception as e:
+        return e
+
+
+def render():
+    e = raise_with_cause()
+    str(e)
+    e.__data__()
+
+
+def main():
+    for name, fn in [
+        ("Log.error + suppress", raise_and_suppress),
+        ("Except.wrap(KeyError)", wrap_native),
+        ("Log.error(cause=)", raise_with_cause),
+        ("render + __data__", render),
+    ]:
+        best = min(timeit.repeat(lambda: deep(DEPTH, fn), number=NUMBER, repeat=REPEAT))
+        print("%-24s %7.1f us" % (name, best / NUMBER * 1e6))
+
+
+if __name__ == "__main__":
+    main()
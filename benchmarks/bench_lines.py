@@ -0,0 +1,84 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+READ LINES FROM A GZIPPED FILE OF JSON LINES (user-038)
+
+    python benchmarks/bench_lines.py [MEGABYTES]
+
+WRITES A TEMPORARY GZIP OF ABOUT MEGABYTES (UNCOMPRESSED, DEFAULT 500),
+THEN TIMES ibytes2ilines(scompressed2ibytes(file)), AND ZLIB ALONE
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import gzip
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import zlib
+
+from mo_http.big_data import ibytes2ilines, scompressed2ibytes
+
+BLOCK_SIZE = 64 * 1024
+
+
+def make_file(filename, size):
+    rand = random.Random(4)
+    num_lines = 0
+    num_bytes = 0
+    with gzip.open(filename, "wb", 6) as output:
+        while num_bytes < size:
+            batch = "".join(
+                json.dumps({
+                    "id": num_lines + i,
+                    "instance_type": "m%d.xlarge" % rand.randint(1, 5),
+                    "price": round(rand.random(), 4),
+                    "tags": ["a" * rand.randint(0, 40), "spot"],
+                }) + "\n"
+                for i in range(10000)
+            ).encode("utf8")
+            output.write(batch)
+            num_lines += 10000
+            num_bytes += len(batch)
+    return num_lines, num_bytes
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    filename = os.path.join(tempfile.mkdtemp(), "lines.json.gz")
+    try:
+        expected, num_bytes = make_file(filename, size * 1000 * 1000)
+
+        with open(filename, "rb") as stream:
+            start = time.time()
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            for block in iter(lambda: stream.read(BLOCK_SIZE), b""):
+                decompressor.decompress(block)
+            duration = time.time() - start
+        print("zlib only        %6.2fs" % duration)
+
+        with open(filename, "rb") as stream:
+            start = time.time()
+            num_lines = 0
+            for _ in ibytes2ilines(scompressed2ibytes(stream)):
+                num_lines += 1
+            duration = time.time() - start
+        if num_lines != expected:
+            print("expecting %d lines, got %d" % (expected, num_lines))
+        print("ibytes2ilines    %6.2fs  %d lines  %.0f MB/s" % (duration, num_lines, num_bytes / 1e6 / duration))
+    finally:
+        os.remove(filename)
+        os.rmdir(os.path.dirname(filename))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+COST OF Log.note() WITH A LOGGER THAT WRITES NOTHING (user-032)
+
+enabled  - THE NOTE IS BUILT AND HANDED TO THE LOGGER
+disabled - THE LEVEL IS ABOVE NOTE (ONLY IF Log.set_level() EXISTS)
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import timeit
+
+from mo_logs import Log
+from mo_logs.log_usingNothing import StructuredLogger
+
+NUMBER = 40 * 1000
+REPEAT = 5
+
+
+def note():
+    Log.note("price {{price|round(decimal=4)}} for {{type}}", price=0.1234567, type="m5.large")
+
+
+def notes():
+    return min(timeit.repeat(note, number=NUMBER, repeat=REPEAT)) / NUMBER
+
+
+def main():
+    Log.main_log = StructuredLogger()
+    print("enabled   %5.2f us" % (notes() * 1e6))
+    if hasattr(Log, "set_level"):
+        Log.set_level("warning")
+        print("disabled  %5.2f us" % (notes() * 1e6))
+
+
+if __name__ == "__main__":
+    main()
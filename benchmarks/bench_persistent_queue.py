@@ -0,0 +1,80 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+PersistentQueue THROUGHPUT AND RECOVERY (user-042)
+
+    python benchmarks/bench_persistent_queue.py [N] [SEGMENT_SIZE]
+
+ADD N ITEMS, POP AND COMMIT 3/4 OF THEM IN BATCHES OF 100, THEN OPEN THE
+SAME FILE AGAIN WITHOUT close(), AS AFTER A CRASH
+
+THE PersistentQUEUE BEFORE user-042 DEADLOCKS IN add(), BECAUSE ITS closed
+PROPERTY RE-ACQUIRES THE QUEUE LOCK. IT MUST BE PATCHED TO RUN THIS
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from mo_collections import persistent_queue
+from mo_collections.persistent_queue import PersistentQueue
+
+BATCH = 100
+
+
+def disk_used(directory):
+    return sum(os.path.getsize(os.path.join(directory, f)) for f in os.listdir(directory))
+
+
+def main():
+    num = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    kwargs = {"segment_size": int(sys.argv[2])} if len(sys.argv) > 2 else {}
+    persistent_queue.DEBUG = False
+    directory = tempfile.mkdtemp()
+    filename = os.path.join(directory, "queue.json")
+    try:
+        queue = PersistentQueue(filename, **kwargs)
+        start = time.time()
+        for i in range(num):
+            queue.add({"id": i, "name": "item %d" % i, "tags": ["a", "b"]})
+        add_time = time.time() - start
+
+        start = time.time()
+        popped = 0
+        while popped < num * 3 // 4:
+            for _ in range(BATCH):
+                if queue.pop().id != popped:
+                    print("out of order at %d" % popped)
+                popped += 1
+            queue.commit()
+        pop_time = time.time() - start
+        size = disk_used(directory)
+
+        # SIMULATE A CRASH: DO NOT close()
+        start = time.time()
+        recovered = PersistentQueue(filename, **kwargs)
+        recover_time = time.time() - start
+        if len(recovered) != num - popped or recovered.pop().id != popped:
+            print("recovered the wrong items")
+
+        print("N=%d  add %.2fs  pop+commit %.2fs  recover %.3fs  disk %.1fMB" % (
+            num, add_time, pop_time, recover_time, size / 1e6
+        ))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    # THE UNCLOSED QUEUES STILL HOLD THEIR THREADS
+    os._exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+WRITE AND READ THE SpotManager PRICE FILE (user-043)
+
+    python benchmarks/bench_price_file.py [NUM_RECORDS]
+
+COMPARES THE CODE SpotManager USED BEFORE (ONE value2json PER RECORD TO
+WRITE, File.read + json2value TO READ) WITH write_array AND iter_array.
+EACH STEP RUNS IN ITS OWN PROCESS, SO THE PEAK RSS IS ITS OWN. THIS NEEDS
+mo_json.stream, SO IT RUNS ONLY ON TREES THAT HAVE IT
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from mo_dots import wrap
+from mo_files import File
+from mo_json import json2value, value2json
+from mo_json.stream import iter_array, write_array
+
+STEPS = ["write per record", "write_array", "File.read + json2value", "iter_array, streamed", "wrap(list(iter_array))"]
+
+
+def prices(num):
+    rand = random.Random(5)
+    for i in range(num):
+        yield wrap({
+            "availability_zone": "us-west-2" + rand.choice("abc"),
+            "instance_type": "m%d.xlarge" % rand.randint(1, 5),
+            "price": round(rand.random(), 4),
+            "product_description": "Linux/UNIX",
+            "timestamp": 1500000000 + i,
+        })
+
+
+def run_step(step, filename, num):
+    if step == "write per record":
+        def stream():
+            # THE OLD SpotManager CODE
+            prefix = "[\n"
+            for p in prices(num):
+                yield prefix
+                yield value2json(p)
+                prefix = ",\n"
+            yield "]"
+        File(filename).write(stream())
+    elif step == "write_array":
+        write_array(File(filename), prices(num))
+    elif step == "File.read + json2value":
+        return len(json2value(File(filename).read(), flexible=False, leaves=False))
+    elif step == "iter_array, streamed":
+        return sum(1 for _ in iter_array(File(filename)))
+    elif step == "wrap(list(iter_array))":
+        return len(wrap(list(iter_array(File(filename)))))
+    return num
+
+
+def peak_rss():
+    # KILOBYTES ON LINUX
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1000
+
+
+def main():
+    num = int(sys.argv[1]) if len(sys.argv) > 1 else 1000 * 1000
+    if len(sys.argv) > 3:
+        # CHILD PROCESS: RUN ONE STEP
+        step, filename = STEPS[int(sys.argv[2])], sys.argv[3]
+        start = time.time()
+        count = run_step(step, filename, num)
+        duration = time.time() - start
+        print("%-24s %6.2fs  %5.0fMB peak RSS  %d records" % (step, duration, peak_rss(), count))
+        return
+
+    filename = os.path.join(tempfile.mkdtemp(), "prices.json")
+    try:
+        start = time.time()
+        count = sum(1 for _ in prices(num))
+        print("generating %d records takes %.2fs" % (count, time.time() - start))
+        for i, step in enumerate(STEPS):
+            sys.stdout.flush()
+            subprocess.check_call([sys.executable, __file__, str(num), str(i), filename])
+            if i < 2:
+                print("%24s %6.1fMB file" % ("", os.path.getsize(filename) / 1e6))
+    finally:
+        os.remove(filename)
+        os.rmdir(os.path.dirname(filename))
+
+
+if __name__ == "__main__":
+    main()
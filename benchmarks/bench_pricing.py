@@ -0,0 +1,151 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+THE TWO jx QUERIES OF SpotManager.pricing() (user-028, user-029)
+
+A SYNTHETIC WEEK OF SPOT PRICES FOR 6 ZONES x NUM_TYPES INSTANCE TYPES.
+THE md5 OF EACH RESULT MUST MATCH BETWEEN TREES
+
+    python benchmarks/bench_pricing.py [NUM_TYPES]
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import hashlib
+import json
+import random
+import sys
+import time
+
+from jx_python import jx
+from jx_python.containers.list_usingPythonList import ListContainer
+from mo_times import DAY, Date, HOUR
+
+NOW = Date("2026-10-01 05:30:00")
+ZONES = ["us-east-1" + c for c in "abcdef"]
+
+
+def make_prices(types, rand):
+    output = []
+    for z in ZONES:
+        for t in types:
+            timestamp = (NOW - 7 * DAY).unix
+            while timestamp < NOW.unix:
+                output.append({
+                    "availability_zone": z,
+                    "instance_type": t,
+                    "price": round(rand.random(), 4),
+                    "timestamp": timestamp,
+                })
+                timestamp += rand.randint(600, 7200)
+    return output
+
+
+def hourly_query(prices):
+    # SAME AS SpotManager.pricing()
+    return jx.run({
+        "from": {
+            "from": ListContainer(name=None, data=prices),
+            "window": [
+                {
+                    "name": "expire",
+                    "value": {"coalesce": [{"rows": {"timestamp": 1}}, {"date": "eod"}]},
+                    "edges": ["availability_zone", "instance_type"],
+                    "sort": "timestamp"
+                },
+                {
+                    "name": "effective",
+                    "value": {"sub": {"timestamp": 3600}}
+                }
+            ]
+        },
+        "edges": [
+            "availability_zone",
+            "instance_type",
+            {
+                "name": "time",
+                "range": {"min": "effective", "max": "expire", "mode": "inclusive"},
+                "allowNulls": False,
+                "domain": {"type": "time", "min": NOW.floor(HOUR) - 7 * DAY, "max": NOW.floor(HOUR) + HOUR, "interval": "hour"}
+            }
+        ],
+        "select": [
+            {"value": "price", "aggregate": "max"},
+            {"aggregate": "count"}
+        ],
+        "where": {"gt": {"expire": NOW.floor(HOUR) - 7 * DAY}},
+        "window": [
+            {
+                "name": "current_price",
+                "value": "rows.last.price",
+                "edges": ["availability_zone", "instance_type"],
+                "sort": "time"
+            }
+        ]
+    }).data
+
+
+def bid80_query(hourly, utility):
+    # SAME AS SpotManager.pricing()
+    bid80 = jx.run({
+        "from": ListContainer(name=None, data=hourly),
+        "edges": [
+            {"value": "availability_zone", "allowNulls": False},
+            {
+                "name": "type",
+                "value": "instance_type",
+                "allowNulls": False,
+                "domain": {"type": "set", "key": "instance_type", "partitions": utility}
+            }
+        ],
+        "select": [
+            {"name": "price_80", "value": "price", "aggregate": "percentile", "percentile": 0.8},
+            {"name": "max_price", "value": "price", "aggregate": "max"},
+            {"aggregate": "count"},
+            {"value": "current_price", "aggregate": "one"},
+            {"name": "all_price", "value": "price", "aggregate": "list"}
+        ],
+        "window": [
+            {"name": "estimated_value", "value": {"div": ["type.utility", "price_80"]}}
+        ]
+    })
+    return jx.sort(bid80.values(), {"value": "estimated_value", "sort": -1})
+
+
+def digest(rows):
+    return hashlib.md5(json.dumps(rows, default=str).encode("utf8")).hexdigest()
+
+
+def main():
+    num_types = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    rand = random.Random(3)
+    types = ["m%d.xlarge" % i for i in range(num_types)]
+    prices = make_prices(types, rand)
+    utility = [{"instance_type": t, "utility": rand.randint(1, 10)} for t in types]
+    print("%d prices for %d zone/type pairs" % (len(prices), len(ZONES) * len(types)))
+
+    start = time.time()
+    hourly = hourly_query(prices)
+    duration = time.time() - start
+    print("hourly %6.2fs  md5 %s" % (duration, digest([
+        [r.availability_zone, r.instance_type, r.price, r.count, r.current_price, r.time]
+        for r in hourly
+    ])))
+
+    start = time.time()
+    bid80 = bid80_query(hourly, utility)
+    duration = time.time() - start
+    print("bid80  %6.2fs  md5 %s" % (duration, digest([
+        [r.availability_zone, r.type.instance_type, r.price_80, r.max_price, r.count]
+        for r in bid80
+    ])))
+
+
+if __name__ == "__main__":
+    main()
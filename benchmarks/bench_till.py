@@ -0,0 +1,59 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+Till TIMER DAEMON UNDER LOAD (user-034)
+
+WITH NUM_PENDING TIMERS WAITING 5-60s, DO NUM_WAITS SHORT WAITS, AND REPORT
+HOW LATE THEY WAKE, AND THE CPU THE PROCESS USED WHILE WAITING.
+LATENESS IS BOUNDED BY THE DAEMON'S POLLING INTERVAL
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import os
+import random
+import time
+
+from mo_threads import Till
+
+NUM_PENDING = 100 * 1000
+NUM_WAITS = 20
+WAIT = 0.05
+
+
+def cpu_time():
+    return sum(os.times()[:2])
+
+
+def main():
+    rand = random.Random(1)
+    pending = [Till(seconds=rand.uniform(5, 60)) for _ in range(NUM_PENDING)]
+    Till(seconds=0.5).wait()  # LET THE DAEMON PICK UP THE PENDING TIMERS
+
+    lateness = []
+    start_cpu = cpu_time()
+    for _ in range(NUM_WAITS):
+        start = time.time()
+        Till(seconds=WAIT).wait()
+        lateness.append(time.time() - start - WAIT)
+    cpu = cpu_time() - start_cpu
+
+    print("%d pending timers" % len(pending))
+    print("wakeup lateness  mean %5.1fms  max %5.1fms" % (
+        sum(lateness) / len(lateness) * 1000,
+        max(lateness) * 1000,
+    ))
+    print("cpu used %.2fs in %.2fs of waiting" % (cpu, NUM_WAITS * WAIT + sum(lateness)))
+
+    # DO NOT WAIT FOR THE PENDING TIMERS
+    os._exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+TypedInserter.typed_encode() ON ETL-LIKE RECORDS (user-050)
+
+    python benchmarks/bench_typed_encoder.py [NUM_RECORDS]
+
+NESTED DICTS, LISTS OF SUBTESTS, TAGS AND NULLS. REPORTS THE BEST OF 5
+PASSES; THE md5 OF THE JSON MUST MATCH BETWEEN TREES
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import copy
+import hashlib
+import random
+import sys
+import time
+
+from jx_elasticsearch.typed_inserter import TypedInserter
+from mo_dots import Data
+
+REPEAT = 5
+
+
+def make_records(num):
+    rand = random.Random(0)
+    output = []
+    for i in range(num):
+        subtests = [
+            {
+                "name": "subtest %d \"quoted\" \u00e9" % j,
+                "ok": rand.random() > 0.1,
+                "duration": rand.random() * 10,
+                "status": rand.choice(["PASS", "FAIL", "TIMEOUT"]),
+            }
+            for j in range(rand.randint(0, 4))
+        ]
+        output.append({"id": "rec-%d" % i, "value": {
+            "etl": {
+                "id": i,
+                "timestamp": 1500000000 + i,
+                "source": {"id": rand.randint(1, 10 ** 6), "name": "active-data-etl", "source": {"id": 7, "bucket": "active-data-test-result"}},
+            },
+            "build": {
+                "branch": rand.choice(["mozilla-central", "mozilla-inbound", "autoland", "try"]),
+                "revision": "%040x" % rand.getrandbits(160),
+                "revision12": "%012x" % rand.getrandbits(48),
+                "date": 1500000000 + rand.randint(0, 10 ** 7),
+                "platform": rand.choice(["linux64", "windows10-64", "macosx64", "android-em-7-0"]),
+                "type": rand.choice([["opt"], ["debug"], ["opt", "asan"]]),
+                "url": "https://queue.taskcluster.net/v1/task/%d/artifacts/public/build/target.tar.bz2" % i,
+            },
+            "run": {
+                "name": "test-linux64/opt-mochitest-e10s-%d" % rand.randint(1, 10),
+                "suite": {"name": "mochitest", "fullname": "mochitest-browser-chrome"},
+                "chunk": rand.randint(1, 20),
+                "type": ["e10s"],
+                "timestamp": 1500000000.5 + i,
+            },
+            "result": {
+                "test": "dom/tests/mochitest/general/test_%d.html" % rand.randint(1, 5000),
+                "ok": rand.random() > 0.05,
+                "status": "PASS",
+                "duration": rand.random() * 100,
+                "start_time": 1500000000.25,
+                "end_time": 1500000100.75,
+                "subtests": subtests,
+                "crash": False,
+                "stats": {"fail": rand.randint(0, 3), "pass": rand.randint(0, 300), "count": 300},
+            },
+            "task": {
+                "id": "Ab%020d" % i,
+                "tags": [{"name": "createdForUser", "value": "user@mozilla.com"}, {"name": "kind", "value": "test"}],
+                "state": "completed",
+                "priority": None,
+                "description": "",
+            },
+            "machine": {
+                "name": "t-linux64-ms-%03d" % rand.randint(1, 400),
+                "os": "linux",
+                "tc_worker_type": "gecko-t-linux-large",
+                "aws_instance_type": "m3.large",
+                "price": round(rand.random(), 4),
+            },
+        }})
+    return output
+
+
+def main():
+    num = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    records = make_records(num)
+    inserter = TypedInserter(id_info=Data(field="_id", version="etl.timestamp"))
+    for r in records[:20]:
+        # WARM UP THE SCHEMA
+        inserter.typed_encode(copy.deepcopy(r))
+
+    best = None
+    digest = None
+    for _ in range(REPEAT):
+        batch = copy.deepcopy(records)
+        start = time.time()
+        output = [inserter.typed_encode(r) for r in batch]
+        duration = time.time() - start
+        best = duration if best is None else min(best, duration)
+        digest = hashlib.md5("".join(o[2] for o in output).encode("utf8")).hexdigest()
+    print("%.3fs for %d records, %.0f records/s, md5 %s" % (best, num, num / best, digest))
+
+
+if __name__ == "__main__":
+    main()
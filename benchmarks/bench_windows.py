@@ -0,0 +1,63 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+SLIDING WINDOW ACCUMULATORS (user-027)
+
+A ROLLING 90th PERCENTILE, AND A ROLLING List, OVER 20K ROWS WITH A
+2000-ROW WINDOW. List.end() COPIES THE WINDOW, SO "List add/sub" CALLS
+IT ONCE PER WINDOW. THE md5 OF THE RESULTS MUST MATCH BETWEEN TREES
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import hashlib
+import json
+import random
+import time
+
+from jx_python import windows
+
+NUM_ROWS = 20000
+WINDOW = 2000
+
+
+def slide(accumulator, values, every=1):
+    """
+    :param every: CALL end() ONCE PER every ROWS
+    """
+    output = []
+    for i, v in enumerate(values):
+        accumulator.add(v)
+        if i >= WINDOW:
+            accumulator.sub(values[i - WINDOW])
+        if i % every == 0:
+            output.append(accumulator.end())
+    return output
+
+
+def main():
+    rand = random.Random(2)
+    values = [rand.random() for _ in range(NUM_ROWS)]
+
+    for name, make, every in [
+        ("Percentile(0.9)", lambda: windows.Percentile(0.9), 1),
+        ("List", lambda: windows.List(), 1),
+        ("List add/sub", lambda: windows.List(), WINDOW),
+    ]:
+        start = time.time()
+        result = slide(make(), values, every)
+        duration = time.time() - start
+        if name.startswith("List"):
+            result = [len(r) for r in result]
+        digest = hashlib.md5(json.dumps(result).encode("utf8")).hexdigest()
+        print("%-16s %6.2fs  md5 %s" % (name, duration, digest))
+
+
+if __name__ == "__main__":
+    main()
@@ -27,6 +27,7 @@ from mo_files import File
 from mo_future import text
 from mo_http import http
 from mo_json import value2json
+from mo_json.stream import iter_array, write_array
 from mo_kwargs import override
 from mo_logs import Except, Log, constants, startup
 from mo_logs.startup import SingleInstance
@@ -721,8 +722,7 @@ class SpotManager(object):
 
         with Timer("Read pricing file"):
             try:
-                content = File(self.settings.price_file).read()
-                cache = convert.json2value(content, flexible=False, leaves=False)
+                cache = wrap(list(iter_array(File(self.settings.price_file))))
             except Exception as e:
                 cache = FlatList()
 
@@ -779,14 +779,7 @@ class SpotManager(object):
 
         with Timer("Save prices to file"):
             new_prices = jx.filter(prices, {"gte": {"timestamp": {"date": "today-2day"}}})
-            def stream():  # IT'S A LOT OF PRICES, STREAM THEM TO FILE
-                prefix = "[\n"
-                for p in new_prices:
-                    yield prefix
-                    yield convert.value2json(p)
-                    prefix = ",\n"
-                yield "]"
-            File(self.settings.price_file).write(stream())
+            write_array(File(self.settings.price_file), new_prices)  # IT'S A LOT OF PRICES, STREAM THEM TO FILE
 
         return ListContainer(name="prices", data=prices)
 
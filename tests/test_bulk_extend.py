@@ -0,0 +1,107 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from __future__ import absolute_import, division, unicode_literals
+
+import random
+import time
+
+from jx_elasticsearch.elasticsearch import BulkSize, Index
+from mo_dots import wrap
+from mo_json import json2value, value2json
+from mo_testing.fuzzytestcase import FuzzyTestCase
+from mo_threads import Lock
+
+
+class FakeCluster(object):
+    """
+    REMEMBERS THE LAST DOCUMENT WRITTEN FOR EACH _id, IN THE ORDER ES WOULD
+    """
+
+    version = "6.2.0"
+
+    def __init__(self, reject=None):
+        self.locker = Lock()
+        self.docs = {}
+        self.reject = reject or (lambda id, attempt: False)
+        self.attempts = {}
+
+    def post(self, path, data, **kwargs):
+        time.sleep(random.random() / 100)  # REQUESTS DO NOT FINISH IN THE ORDER SENT
+        lines = data.decode("utf8").strip().split("\n")
+        items = []
+        with self.locker:
+            for action, doc in zip(lines[::2], lines[1::2]):
+                id = json2value(action).index._id
+                attempt = self.attempts[id] = self.attempts.get(id, 0) + 1
+                if self.reject(id, attempt):
+                    items.append({"index": {"_id": id, "status": 429}})
+                else:
+                    self.docs[id] = json2value(doc)
+                    items.append({"index": {"_id": id, "status": 201}})
+        return wrap({"items": items})
+
+
+def fake_index(cluster, bulk_threads):
+    index = object.__new__(Index)
+    index.cluster = cluster
+    index.debug = False
+    index.path = "/test"
+    index.bulk_size = BulkSize(size=3, min_size=1)
+    index.encode = lambda r: (r["id"], None, value2json(r["value"]))
+    index.settings = wrap({
+        "index": "test",
+        "read_only": False,
+        "bulk_threads": bulk_threads,
+        "bulk_bytes": 10 * 1000 * 1000,
+        "consistency": "one",
+    })
+    return index
+
+
+class TestBulkExtend(FuzzyTestCase):
+
+    def test_same_id_keeps_order(self):
+        cluster = FakeCluster()
+        index = fake_index(cluster, 4)
+        records = [{"id": text_id(i % 7), "value": {"n": i}} for i in range(200)]
+        index.extend(records)
+        for i in range(7):
+            self.assertEqual(cluster.docs[text_id(i)].n, max(n for n in range(200) if n % 7 == i))
+
+    def test_rejected_older_document_is_not_retried(self):
+        # THE FIRST WRITE OF EVERY _id IS REJECTED; THE NEWER DOCUMENT MUST STAY
+        cluster = FakeCluster(reject=lambda id, attempt: attempt == 1)
+        index = fake_index(cluster, 2)
+        index.bulk_size = BulkSize(size=100, min_size=1)
+        index.extend([{"id": "a", "value": {"n": 1}}, {"id": "a", "value": {"n": 2}}])
+        self.assertEqual(cluster.docs["a"].n, 2)
+
+    def test_no_records(self):
+        index = fake_index(FakeCluster(), 4)
+        index.extend(EmptyIterable())
+
+    def test_no_threads(self):
+        cluster = FakeCluster()
+        index = fake_index(cluster, 0)
+        index.extend([{"id": "a", "value": {"n": 1}}])
+        self.assertEqual(cluster.docs["a"].n, 1)
+
+
+class EmptyIterable(object):
+    """
+    TRUTHY, BUT YIELDS NOTHING
+    """
+
+    def __iter__(self):
+        return iter([])
+
+
+def text_id(i):
+    return "id" + str(i)
@@ -0,0 +1,211 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from __future__ import absolute_import, division, unicode_literals
+
+import copy
+import os
+import shutil
+import tempfile
+
+import jx_base
+from jx_base import TableDesc
+from jx_base.meta_columns import META_TABLES_DESC, META_TABLES_NAME
+from jx_elasticsearch import elasticsearch
+from jx_elasticsearch.meta import ElasticsearchMetadata
+from jx_elasticsearch.meta_columns import ColumnList
+from jx_python.containers.list_usingPythonList import ListContainer
+from mo_dots import Data, ROOT_PATH, wrap
+from mo_files import File
+from mo_testing.fuzzytestcase import FuzzyTestCase
+from mo_threads import Lock, Queue, Till
+from mo_times import Date
+
+
+def index_meta(alias, uuid, version, properties):
+    return {
+        "aliases": [alias],
+        "settings": {"index": {"uuid": uuid, "creation_date": "1"}},
+        "mapping_version": version,
+        "mappings": {"t": {"properties": properties}},
+    }
+
+
+class FakeCluster(elasticsearch.Cluster):
+    """
+    ANSWERS /_cluster/state FROM self.state, AND EVERY COLUMN PROBE WITH THE SAME STATS
+    """
+
+    def __new__(cls, state):
+        return object.__new__(cls)
+
+    def __init__(self, state):
+        self.state = state
+        self.settings = wrap({"explore_metadata": True})
+        self._metadata = wrap({})
+        self.index_last_updated = {}
+        self.metadata_locker = Lock()
+        self.metatdata_last_updated = Date.MIN
+        self.debug = False
+        self.url = "fake"
+
+    def get(self, path, **kwargs):
+        if path == "/_cluster/state":
+            return wrap({"metadata": {"indices": copy.deepcopy(self.state)}})
+        return wrap({"version": {"number": "6.2.0"}})
+
+    def post(self, path, data=None, **kwargs):
+        return wrap({
+            "hits": {"total": 10},
+            "aggregations": {"count": {"value": 3}, "_": {"buckets": [{"key": 1}, {"key": 2}, {"key": 3}]}},
+        })
+
+    def get_index(self, **kwargs):
+        return None
+
+    def get_best_matching_index(self, alias):
+        for i, d in self.state.items():
+            if alias in d["aliases"]:
+                return Data(index=i, alias=alias)
+
+
+def fake_metadata(cluster, local_state=None):
+    """
+    ElasticsearchMetadata WITHOUT THE monitor THREAD, OR THE meta.columns TABLE IN ES
+    """
+    columns = object.__new__(ColumnList)
+    columns.name = "meta.columns"
+    columns.data = {}
+    columns.locker = Lock()
+    columns._schema = None
+    columns.dirty = False
+    columns.es_cluster = cluster
+    columns.for_es_update = Queue("update columns to es")
+
+    output = object.__new__(ElasticsearchMetadata)
+    output.settings = wrap({})
+    output.es_cluster = cluster
+    output.index_does_not_exist = set()
+    output.todo = Queue("refresh metadata", max=100000, unique=True)
+    output.cold = Queue("refresh cold metadata", max=100000, unique=True)
+    output.next_cold_scan = Date.now()
+    output.last_queried = {}
+    output.local_state = File(local_state) if local_state else None
+    output.next_local_save = Date.now()
+    output.meta = Data()
+    output.meta.columns = columns
+    output._load_local_state()
+    output.meta.tables = ListContainer(META_TABLES_NAME, [], jx_base.Schema(".", META_TABLES_DESC.columns))
+    output.alias_to_query_paths = {}
+    for i, settings in cluster.get_metadata(after=Date.now()).indices.items():
+        alias = settings.aliases[0]
+        desc = TableDesc(
+            name=alias,
+            url=None,
+            query_path=ROOT_PATH,
+            last_updated=cluster.metatdata_last_updated,
+            columns=[],
+        )
+        output.meta.tables.add(desc)
+        output.alias_to_query_paths[alias] = [desc.query_path]
+    return output
+
+
+class TestEsMetadata(FuzzyTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.state = {
+            "x1": index_meta("a_x", "x1", 1, {"a": {"type": "keyword", "store": True}, "b": {"type": "long", "store": True}}),
+            "y1": index_meta("a_y", "y1", 1, {"c": {"type": "keyword", "store": True}}),
+        }
+        self.cluster = FakeCluster(self.state)
+        self.num_diffs = 0
+        self.diff_schema = elasticsearch.diff_schema
+
+        def counting_diff(a, b):
+            self.num_diffs += 1
+            return self.diff_schema(a, b)
+
+        elasticsearch.diff_schema = counting_diff
+
+    def tearDown(self):
+        elasticsearch.diff_schema = self.diff_schema
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def scanned(self, meta):
+        # ALL KNOWN COLUMNS HAVE STATS, AND NOTHING IS WAITING
+        meta.todo.pop_all()
+        meta.cold.pop_all()
+        for c in meta.meta.columns:
+            c.cardinality = 5
+            c.last_updated = Date.now()
+
+    def test_mapping_change_queues_only_new_column(self):
+        meta = fake_metadata(self.cluster)
+        meta._reload_columns(meta.get_table("a_x"), after=Date.now())
+        meta._reload_columns(meta.get_table("a_y"), after=Date.now())
+        self.scanned(meta)
+
+        self.state["x1"]["mappings"]["t"]["properties"]["d"] = {"type": "long", "store": True}
+        self.state["x1"]["mapping_version"] = 2
+        Till(seconds=0.01).wait()
+        self.num_diffs = 0
+        self.cluster.get_metadata(after=Date.now())
+        self.assertEqual(self.num_diffs, 1)
+
+        meta.get_columns("a_y")
+        self.assertEqual(len(meta.todo) + len(meta.cold), 0, "a_y did not change")
+
+        columns = meta.get_columns("a_x")
+        self.assertEqual(set(c.name for c in columns), {".", "_id", "a", "b", "d"})
+        self.assertEqual([w[0].name for w in meta.todo.queue], ["d"])
+        self.assertEqual(len(meta.cold), 0)
+        self.assertEqual(
+            {c.name: c.cardinality for c in columns},
+            {".": 5, "_id": 5, "a": 5, "b": 5, "d": None},
+            "known stats are kept",
+        )
+
+    def test_same_mapping_version_is_not_diffed(self):
+        fake_metadata(self.cluster)
+        Till(seconds=0.01).wait()
+        self.num_diffs = 0
+        self.cluster.get_metadata(after=Date.now())
+        self.assertEqual(self.num_diffs, 0)
+
+    def test_query_moves_cold_columns_to_todo(self):
+        meta = fake_metadata(self.cluster)
+        meta._reload_columns(meta.get_table("a_x"), after=Date.now())
+        meta._reload_columns(meta.get_table("a_y"), after=Date.now())
+        self.assertEqual(len(meta.todo), 0)
+        num_cold = len(meta.cold)
+
+        meta.get_columns("a_y")
+        self.assertEqual(set(w[0].es_index for w in meta.todo.queue), {"a_y"})
+        self.assertEqual(set(w[0].es_index for w in meta.cold.queue), {"a_x"})
+        self.assertEqual(meta.cold.num_added - meta.cold.num_popped, len(meta.cold))
+        self.assertEqual(len(meta.cold) + len(meta.todo), num_cold)
+
+    def test_local_state_round_trip(self):
+        filename = os.path.join(self.directory, "state.json")
+        meta = fake_metadata(self.cluster, filename)
+        meta._reload_columns(meta.get_table("a_x"), after=Date.now())
+        meta._reload_columns(meta.get_table("a_y"), after=Date.now())
+        self.scanned(meta)
+        meta.get_columns("a_x")
+        meta._save_local_state()
+
+        restarted = fake_metadata(FakeCluster(self.state), filename)
+        self.assertEqual(
+            sorted((c.es_index, c.name, c.cardinality) for c in restarted.meta.columns),
+            sorted((c.es_index, c.name, c.cardinality) for c in meta.meta.columns),
+        )
+        self.assertEqual(sorted(restarted.last_queried), ["a_x"])
+        self.assertEqual(len(restarted.todo) + len(restarted.cold), 0)
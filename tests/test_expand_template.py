@@ -0,0 +1,71 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from __future__ import absolute_import, division, unicode_literals
+
+from mo_logs import strings
+from mo_logs.strings import expand_template
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+# (template, params, expected); expected IS WHAT THE INTERPRETER, BEFORE
+# TEMPLATES WERE COMPILED, RENDERED
+GOLDEN = [
+    ("no variables at all", {}, "no variables at all"),
+    ("{{a}}", {"a": "x"}, "x"),
+    ("a={{a}}, b={{b}}", {"a": 1, "b": 2.5}, "a=1, b=2.5"),
+    ("{{a.b.c}}", {"a": {"b": {"c": "deep"}}}, "deep"),
+    ("[{{missing}}]", {}, "[]"),
+    ("[{{a.missing}}]", {"a": {}}, "[]"),
+    ("{{a|upper}} {{a|lower}}", {"a": "MiXeD"}, "MIXED mixed"),
+    ("{{a|quote}}", {"a": "say \"hi\"\n"}, "\"say \\\"hi\\\"\\n\""),
+    ("{{a|json}}", {"a": {"k": [1, 2, {"z": None}]}}, "{\"k\": [1, 2, {}]}"),
+    ("{{a}}", {"a": {"k": "v"}}, "{\"k\": \"v\"}"),
+    ("{{a}}", {"a": [1, "two", 3.0]}, "[1, \"two\", 3]"),
+    ("{{n|round(digits=3)}}", {"n": 3.14159}, "3.14"),
+    ("{{n|round(decimal=1)}}", {"n": 2.25}, "2.2"),
+    ("{{n|comma}}", {"n": 1234567}, "1,234,567"),
+    ("{{n|percent(digits=2)}}", {"n": 0.1234}, "12%"),
+    ("{{s|left(3)}}|{{s|right(3)}}", {"s": "abcdefg"}, "abc|efg"),
+    ("{{s|limit(5)}}", {"s": "a long string of text"}, "a lon"),
+    ("{{s|between(prefix='<', suffix='>')}}", {"s": "x<inner>y"}, "inner"),
+    ("{{s|replace('a', 'o')}}", {"s": "banana"}, "bonono"),
+    ("{{s|indent}}", {"s": "line1\nline2"}, "\tline1\n\tline2"),
+    ("{{s|html}}", {"s": "<b>&</b>"}, "<b>&</b>"),
+    ("{{s|strip}}", {"s": "  padded  "}, "padded"),
+    ("{{s|hex}}", {"s": 255}, "255"),
+    ("{{list.1}}", {"list": ["zero", "one", "two"]}, "[\"e\", \"n\", \"w\"]"),
+    ("{{list.x}}", {"list": ["zero", "one"]}, "[null, null]"),
+    ("{{u}} {{u|upper}}", {"u": "héllo wörld ☃"}, "héllo wörld ☃ HÉLLO WÖRLD ☃"),
+    ("ünïcödé {{a}} tëmplaté", {"a": "✓"}, "ünïcödé ✓ tëmplaté"),
+    ("{{a|unknown_formatter}}", {"a": 1}, "1"),
+    ("{{a|round(decimal=}}", {"a": 1}, "1"),
+    ("{{a|upper|quote}}", {"a": "chain"}, "\"CHAIN\""),
+    ("{{a}} and {{a}} again", {"a": "twice"}, "twice and twice again"),
+    ("unclosed {{a", {"a": 1}, "unclosed {{a"),
+    ("{ {a} } {a}", {"a": 1}, "{ {a} } {a}"),
+    ("{{a}}{{b}}{{c}}", {"a": "", "b": None, "c": 0}, "0"),
+    ("{{a}}", {"a": True}, "True"),
+    ({"from": "rows", "template": "{{name}}={{..title}}", "separator": ", "}, {"rows": [{"name": "x"}, {"name": "y"}], "title": "T"}, "x=T, y=T"),
+    (["{{a}}", "-", "{{b}}"], {"a": 1, "b": 2}, "1-2"),
+]
+
+
+class TestExpandTemplate(FuzzyTestCase):
+
+    def test_golden(self):
+        for template, params, expected in GOLDEN:
+            self.assertEqual(expand_template(template, params), expected, msg=repr(template))
+
+    def test_golden_from_cache(self):
+        # SECOND RENDER USES THE COMPILED TEMPLATE
+        strings._compiled_templates.clear()
+        for template, params, expected in GOLDEN:
+            expand_template(template, params)
+        for template, params, expected in GOLDEN:
+            self.assertEqual(expand_template(template, params), expected, msg=repr(template))
@@ -0,0 +1,40 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from __future__ import absolute_import, division, unicode_literals
+
+from mo_collections.matrix import Matrix, NumericMatrix
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+DIMS = [(), (0,), (3,), (0, 4), (4, 0), (2, 0, 3), (2, 3), (2, 3, 4)]
+
+
+class TestNumericMatrix(FuzzyTestCase):
+
+    def test_same_cube_as_matrix(self):
+        for dims in DIMS:
+            for zeros in [0, 7]:
+                expected = Matrix(dims=dims, zeros=zeros)
+                result = NumericMatrix(dims=dims, zeros=zeros, typecode="l")
+                self.assertEqual(result.cube, expected.cube, "dims=" + str(dims))
+                self.assertEqual(bool(result), bool(expected), "dims=" + str(dims))
+
+    def test_zero_dim_is_zeros(self):
+        self.assertEqual(NumericMatrix(dims=(0,), zeros=0, typecode="l").cube, 0)
+        self.assertEqual(NumericMatrix(dims=(3, 0), zeros=5, typecode="l").cube, 5)
+        self.assertEqual(NumericMatrix(dims=(3, 0), zeros=5, typecode="l").reshape((0, 3)).cube, 5)
+
+    def test_counts(self):
+        expected = Matrix(dims=(2, 3), zeros=0)
+        result = NumericMatrix(dims=(2, 3), zeros=0, typecode="l")
+        for c in [(0, 0), (1, 2), (1, 2), (0, 1)]:
+            expected[c] += 1
+            result.add(c, 1)
+        self.assertEqual(result.cube, expected.cube)
+        self.assertEqual(result[1, 2], 2)
@@ -0,0 +1,112 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from __future__ import absolute_import, division, unicode_literals
+
+import io
+import os
+import shutil
+import tempfile
+
+from mo_collections import persistent_queue
+from mo_collections.persistent_queue import PersistentQueue, SEGMENT_EXTENSION
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+
+class TestPersistentQueue(FuzzyTestCase):
+
+    def setUp(self):
+        persistent_queue.DEBUG = False
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, "queue.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def segments(self):
+        return sorted(c for c in os.listdir(self.directory) if c.endswith(SEGMENT_EXTENSION))
+
+    def test_reopen_with_extension(self):
+        queue = PersistentQueue(self.filename, segment_size=10)
+        queue.extend(list(range(10)))
+        queue.close()
+        self.assertGreater(len(self.segments()), 1)
+
+        queue = PersistentQueue(self.filename, segment_size=10)
+        self.assertEqual(len(queue), 10)
+        self.assertEqual(queue[0], 0)
+        self.assertEqual([queue.pop() for _ in range(10)], list(range(10)))
+        queue.commit()
+        queue.close()
+        self.assertEqual(self.segments(), [])
+
+    def test_close_with_unsynced_adds(self):
+        queue = PersistentQueue(self.filename, sync_every=5)
+        queue.extend([1, 2, 3])
+        self.assertEqual(queue.pop(), 1)
+        queue.close()
+
+        queue = PersistentQueue(self.filename, sync_every=5)
+        self.assertEqual(queue.pop_all(), [2, 3])
+        queue.close()
+
+    def test_recover_deletes_consumed_segments(self):
+        queue = PersistentQueue(self.filename, segment_size=10)
+        queue.extend(list(range(10)))
+        first = self.segments()[0]
+        self.assertEqual(queue.pop(), 0)
+        self.assertEqual(queue.pop(), 1)
+        queue.commit()
+        queue.close()
+
+        # SIMULATE A CRASH BEFORE THE CONSUMED SEGMENT WAS DELETED
+        stale = os.path.join(self.directory, first)
+        io.open(stale, "wb").close()
+
+        queue = PersistentQueue(self.filename, segment_size=10)
+        self.assertEqual(queue.pop(), 2)
+        queue.close()
+        self.assertFalse(os.path.exists(stale))
+
+    def test_damaged_checkpoint_keeps_segments(self):
+        queue = PersistentQueue(self.filename, segment_size=10)
+        queue.extend(list(range(10)))
+        queue.close()
+
+        # SIMULATE A CRASH WHILE THE CHECKPOINT WAS NOT YET ON DISK
+        io.open(self.filename, "wb").close()
+
+        queue = PersistentQueue(self.filename, segment_size=10)
+        self.assertEqual(queue.pop_all(), list(range(10)))
+        queue.commit()
+        queue.close()
+
+    def test_missing_checkpoint_keeps_segments(self):
+        queue = PersistentQueue(self.filename, segment_size=10)
+        queue.extend(list(range(10)))
+        queue.close()
+        os.remove(self.filename)
+
+        queue = PersistentQueue(self.filename, segment_size=10)
+        self.assertEqual(queue.pop_all(), list(range(10)))
+        queue.add(10)
+        self.assertEqual(queue.pop_all(), [10])
+        queue.commit()
+        queue.close()
+
+    def test_upgrade_old_format(self):
+        with io.open(self.filename, "w") as f:
+            f.write('{"add": {"status.start": 0}}\n')
+            f.write('{"add": {"0": "a"}}\n{"add": {"status.end": 1}}\n')
+            f.write('{"add": {"1": "b"}}\n{"add": {"status.end": 2}}\n')
+
+        queue = PersistentQueue(self.filename)
+        self.assertEqual(queue.pop_all(), ["a", "b"])
+        queue.commit()
+        queue.close()